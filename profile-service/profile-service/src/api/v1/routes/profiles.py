@@ -1,19 +1,31 @@
 """
 Candidate profile routes
 """
-from datetime import datetime
+import asyncio
+import re
+from datetime import datetime, timezone
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from fastapi import Request
 from bson import ObjectId
+from pymongo import DESCENDING, ReturnDocument
 from typing import Optional, List
 from src.config.database import get_database
-from src.models.profile import Profile, ProfileCreate, ProfileUpdate, ProfileResponse
+from src.models.profile import ProfileCreate, ProfileUpdate, ProfileResponse
 from src.middleware.auth import get_current_user, require_roles, check_organization_access
 from src.utils.logger import setup_logger
+from src.utils.object_id import parse_object_id
+from src.utils.pagination import build_pagination, encode_cursor, keyset_filter
+from src.utils.serialization import MongoJSONResponse
 
 logger = setup_logger(__name__)
 router = APIRouter()
 
+# Newest first, _id breaks ties so cursor pagination is stable
+_SORT_CREATED_DESC = [("createdAt", DESCENDING), ("_id", DESCENDING)]
+
+# Upper bound on distinct skills accepted by the list filter
+_MAX_SKILL_FILTERS = 32
+
 
 @router.post("", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def create_profile(
@@ -38,10 +50,10 @@ async def create_profile(
             detail="You can only create a profile for yourself"
         )
     
+    user_oid = parse_object_id("user ID", profile_data.userId)
+    
     # Check if profile already exists for this user
-    existing_profile = await db.candidate_profiles.find_one({
-        "userId": ObjectId(profile_data.userId)
-    })
+    existing_profile = await db.candidate_profiles.find_one({"userId": user_oid}, projection={"_id": 1})
     
     if existing_profile:
         raise HTTPException(
@@ -51,14 +63,13 @@ async def create_profile(
     
     # Prepare profile document
     profile_doc = profile_data.model_dump(exclude={"userId", "organizationId"})
-    profile_doc["userId"] = ObjectId(profile_data.userId)
+    profile_doc["userId"] = user_oid
     
     if profile_data.organizationId:
-        profile_doc["organizationId"] = ObjectId(profile_data.organizationId)
+        profile_doc["organizationId"] = parse_object_id("organization ID", profile_data.organizationId)
     
     profile_doc["isActive"] = True
-    profile_doc["createdAt"] = datetime.utcnow()
-    profile_doc["updatedAt"] = datetime.utcnow()
+    profile_doc["createdAt"] = profile_doc["updatedAt"] = datetime.now(timezone.utc)
     
     # Insert profile
     result = await db.candidate_profiles.insert_one(profile_doc)
@@ -66,13 +77,13 @@ async def create_profile(
     
     logger.info(f"Profile created: {profile_doc['_id']} for user {profile_data.userId}")
     
-    return {
+    return MongoJSONResponse({
         "success": True,
         "message": "Profile created successfully",
         "data": {
-            "profile": Profile.profile_to_dict(profile_doc)
+            "profile": profile_doc
         }
-    }
+    }, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/{profile_id}", response_model=dict)
@@ -83,13 +94,8 @@ async def get_profile(
     """Get profile by ID"""
     db = get_database()
     
-    if not ObjectId.is_valid(profile_id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid profile ID format"
-        )
-    
-    profile = await db.candidate_profiles.find_one({"_id": ObjectId(profile_id)})
+    oid = parse_object_id("profile ID", profile_id)
+    profile = await db.candidate_profiles.find_one({"_id": oid})
     
     if not profile:
         raise HTTPException(
@@ -118,12 +124,12 @@ async def get_profile(
                 detail="Access denied"
             )
     
-    return {
+    return MongoJSONResponse({
         "success": True,
         "data": {
-            "profile": Profile.profile_to_dict(profile)
+            "profile": profile
         }
-    }
+    })
 
 
 @router.get("", response_model=dict)
@@ -131,10 +137,13 @@ async def list_profiles(
     userId: Optional[str] = Query(None, description="Filter by user ID"),
     organizationId: Optional[str] = Query(None, description="Filter by organization ID"),
     location: Optional[str] = Query(None, description="Filter by location (partial match)"),
-    skills: Optional[str] = Query(None, description="Comma-separated list of skills to filter by"),
+    skills: Optional[str] = Query(
+        None, description=f"Comma-separated list of skills to filter by (at most {_MAX_SKILL_FILTERS})"
+    ),
     isActive: Optional[bool] = Query(None, description="Filter by active status"),
-    page: int = Query(1, ge=1, description="Page number"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor returned as nextCursor by the previous page"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    includeTotal: bool = Query(False, description="Include the total number of matching profiles"),
     current_user: dict = Depends(get_current_user)
 ):
     """List profiles with filters and pagination"""
@@ -156,53 +165,66 @@ async def list_profiles(
     
     # Apply filters
     if userId:
-        if not ObjectId.is_valid(userId):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid user ID format"
-            )
-        query["userId"] = ObjectId(userId)
+        query["userId"] = parse_object_id("user ID", userId)
     
     if organizationId:
-        if not ObjectId.is_valid(organizationId):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid organization ID format"
-            )
-        query["organizationId"] = ObjectId(organizationId)
+        query["organizationId"] = parse_object_id("organization ID", organizationId)
     
     if location:
-        query["location"] = {"$regex": location, "$options": "i"}
+        # Case-insensitive substring match, escaped so input is matched literally
+        query["location"] = re.compile(re.escape(location), re.IGNORECASE)
     
     if skills:
-        skill_list = [s.strip().lower() for s in skills.split(",")]
-        query["skills"] = {"$in": skill_list}
+        # Deduplicated and capped so the $in array stays small
+        skill_list = list(dict.fromkeys(
+            s.strip().lower() for s in skills.split(",") if s.strip()
+        ))[:_MAX_SKILL_FILTERS]
+        if skill_list:
+            query["skills"] = {"$in": skill_list}
     
     if isActive is not None:
         query["isActive"] = isActive
     
-    # Pagination
-    skip = (page - 1) * limit
+    # Keyset pagination on (createdAt, _id)
+    page_query = query
+    if cursor:
+        try:
+            page_query = {**query, **keyset_filter(cursor)}
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
     
     # Get profiles
-    cursor = db.candidate_profiles.find(query).skip(skip).limit(limit).sort("createdAt", -1)
-    profiles = await cursor.to_list(length=limit)
-    
-    # Get total count
-    total = await db.candidate_profiles.count_documents(query)
+    # Fetch one extra document to know whether another page exists
+    profiles_cursor = db.candidate_profiles.find(page_query).sort(_SORT_CREATED_DESC).limit(limit + 1)
+    
+    # Total count is opt-in and runs concurrently with the page read, over the filters without the cursor
+    total = None
+    if includeTotal:
+        profiles, total = await asyncio.gather(
+            profiles_cursor.to_list(length=limit + 1),
+            db.candidate_profiles.count_documents(query)
+        )
+    else:
+        profiles = await profiles_cursor.to_list(length=limit + 1)
+    has_more = len(profiles) > limit
+    profiles = profiles[:limit]
     
-    return {
+    # Documents are serialized as-is, ObjectIds are stringified by the response encoder
+    return MongoJSONResponse({
         "success": True,
         "data": {
-            "profiles": [Profile.profile_to_dict(profile) for profile in profiles],
-            "pagination": {
-                "page": page,
-                "limit": limit,
-                "total": total,
-                "pages": (total + limit - 1) // limit
-            }
+            "profiles": profiles,
+            "pagination": build_pagination(
+                limit,
+                has_more,
+                next_cursor=encode_cursor(profiles[-1]) if has_more else None,
+                total=total
+            )
         }
-    }
+    })
 
 
 @router.put("/{profile_id}", response_model=dict)
@@ -215,13 +237,11 @@ async def update_profile(
     """Update profile"""
     db = get_database()
     
-    if not ObjectId.is_valid(profile_id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid profile ID format"
-        )
-    
-    profile = await db.candidate_profiles.find_one({"_id": ObjectId(profile_id)})
+    oid = parse_object_id("profile ID", profile_id)
+    profile = await db.candidate_profiles.find_one(
+        {"_id": oid},
+        projection={"userId": 1, "organizationId": 1}
+    )
     
     if not profile:
         raise HTTPException(
@@ -253,24 +273,23 @@ async def update_profile(
     # Prepare update
     update_data = profile_update.model_dump(exclude_unset=True)
     if update_data:
-        update_data["updatedAt"] = datetime.utcnow()
-        await db.candidate_profiles.update_one(
-            {"_id": ObjectId(profile_id)},
-            {"$set": update_data}
+        updated_profile = await db.candidate_profiles.find_one_and_update(
+            {"_id": oid},
+            {"$set": update_data, "$currentDate": {"updatedAt": True}},
+            return_document=ReturnDocument.AFTER
         )
         
         logger.info(f"Profile updated: {profile_id} by {current_user['_id']}")
+    else:
+        updated_profile = await db.candidate_profiles.find_one({"_id": oid})
     
-    # Get updated profile
-    updated_profile = await db.candidate_profiles.find_one({"_id": ObjectId(profile_id)})
-    
-    return {
+    return MongoJSONResponse({
         "success": True,
         "message": "Profile updated successfully",
         "data": {
-            "profile": Profile.profile_to_dict(updated_profile)
+            "profile": updated_profile
         }
-    }
+    })
 
 
 @router.get("/user/{user_id}", response_model=dict)
@@ -281,13 +300,8 @@ async def get_profile_by_user_id(
     """Get profile by user ID"""
     db = get_database()
     
-    if not ObjectId.is_valid(user_id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid user ID format"
-        )
-    
-    profile = await db.candidate_profiles.find_one({"userId": ObjectId(user_id)})
+    user_oid = parse_object_id("user ID", user_id)
+    profile = await db.candidate_profiles.find_one({"userId": user_oid})
     
     if not profile:
         raise HTTPException(
@@ -315,10 +329,10 @@ async def get_profile_by_user_id(
                 detail="Access denied"
             )
     
-    return {
+    return MongoJSONResponse({
         "success": True,
         "data": {
-            "profile": Profile.profile_to_dict(profile)
+            "profile": profile
         }
-    }
+    })
 
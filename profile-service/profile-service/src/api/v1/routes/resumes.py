@@ -1,19 +1,50 @@
 """
 Resume metadata routes
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from fastapi import Request
 from bson import ObjectId
+from pymongo import DESCENDING, InsertOne, ReturnDocument, UpdateMany
 from typing import Optional
 from src.config.database import get_database
-from src.models.resume import ResumeMetadata, ResumeMetadataCreate, ResumeMetadataUpdate, ResumeMetadataResponse
+from src.models.resume import ResumeMetadataCreate, ResumeMetadataUpdate, ResumeMetadataResponse
 from src.middleware.auth import get_current_user, require_roles
 from src.utils.logger import setup_logger
+from src.utils.object_id import parse_object_id
+from src.utils.pagination import build_pagination, encode_cursor, keyset_filter
+from src.utils.serialization import MongoJSONResponse
 
 logger = setup_logger(__name__)
 router = APIRouter()
 
+# Newest first, _id breaks ties between resumes uploaded at the same instant
+_SORT_UPLOADED_DESC = [("uploadedAt", DESCENDING), ("_id", DESCENDING)]
+
+
+async def _find_resume_with_profile(db, resume_oid: ObjectId, projection: Optional[dict] = None):
+    """Fetch a resume and its owning profile's authorization fields in one round-trip"""
+    pipeline = [
+        {"$match": {"_id": resume_oid}},
+        {"$lookup": {
+            "from": "candidate_profiles",
+            "localField": "profileId",
+            "foreignField": "_id",
+            "as": "_profile",
+            "pipeline": [{"$project": {"userId": 1, "organizationId": 1}}]
+        }}
+    ]
+    if projection:
+        pipeline.append({"$project": {**projection, "_profile": 1}})
+    
+    resumes = await db.resume_metadata.aggregate(pipeline).to_list(length=1)
+    if not resumes:
+        return None, None
+    
+    resume = resumes[0]
+    profiles = resume.pop("_profile")
+    return resume, profiles[0] if profiles else None
+
 
 @router.post("", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def create_resume_metadata(
@@ -25,13 +56,8 @@ async def create_resume_metadata(
     db = get_database()
     
     # Verify profile exists and belongs to user
-    if not ObjectId.is_valid(resume_data.profileId):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid profile ID format"
-        )
-    
-    profile = await db.candidate_profiles.find_one({"_id": ObjectId(resume_data.profileId)})
+    profile_oid = parse_object_id("profile ID", resume_data.profileId)
+    profile = await db.candidate_profiles.find_one({"_id": profile_oid}, projection={"userId": 1})
     
     if not profile:
         raise HTTPException(
@@ -52,32 +78,33 @@ async def create_resume_metadata(
                 detail="You can only add resumes to your own profile"
             )
     
-    # If this is set as primary, unset other primary resumes
-    if resume_data.isPrimary:
-        await db.resume_metadata.update_many(
-            {"profileId": ObjectId(resume_data.profileId), "isActive": True},
-            {"$set": {"isPrimary": False}}
-        )
-    
     # Prepare resume document
     resume_doc = resume_data.model_dump()
-    resume_doc["profileId"] = ObjectId(resume_data.profileId)
-    resume_doc["uploadedAt"] = datetime.utcnow()
-    resume_doc["updatedAt"] = datetime.utcnow()
+    resume_doc["_id"] = ObjectId()
+    resume_doc["profileId"] = profile_oid
+    resume_doc["uploadedAt"] = resume_doc["updatedAt"] = datetime.now(timezone.utc)
+    
+    # If this is set as primary, unset other primary resumes in the same ordered batch as the insert
+    operations = []
+    if resume_data.isPrimary:
+        operations.append(UpdateMany(
+            {"profileId": profile_oid, "isActive": True, "isPrimary": True},
+            {"$set": {"isPrimary": False}}
+        ))
+    operations.append(InsertOne(resume_doc))
     
     # Insert resume metadata
-    result = await db.resume_metadata.insert_one(resume_doc)
-    resume_doc["_id"] = result.inserted_id
+    await db.resume_metadata.bulk_write(operations, ordered=True)
     
     logger.info(f"Resume metadata created: {resume_doc['_id']} for profile {resume_data.profileId}")
     
-    return {
+    return MongoJSONResponse({
         "success": True,
         "message": "Resume metadata created successfully",
         "data": {
-            "resume": ResumeMetadata.resume_to_dict(resume_doc)
+            "resume": resume_doc
         }
-    }
+    }, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/{resume_id}", response_model=dict)
@@ -88,13 +115,8 @@ async def get_resume_metadata(
     """Get resume metadata by ID"""
     db = get_database()
     
-    if not ObjectId.is_valid(resume_id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid resume ID format"
-        )
-    
-    resume = await db.resume_metadata.find_one({"_id": ObjectId(resume_id)})
+    resume_oid = parse_object_id("resume ID", resume_id)
+    resume, profile = await _find_resume_with_profile(db, resume_oid)
     
     if not resume:
         raise HTTPException(
@@ -102,9 +124,6 @@ async def get_resume_metadata(
             detail="Resume not found"
         )
     
-    # Get associated profile for authorization check
-    profile = await db.candidate_profiles.find_one({"_id": resume.get("profileId")})
-    
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -124,12 +143,12 @@ async def get_resume_metadata(
                 detail="You can only view your own resumes"
             )
     
-    return {
+    return MongoJSONResponse({
         "success": True,
         "data": {
-            "resume": ResumeMetadata.resume_to_dict(resume)
+            "resume": resume
         }
-    }
+    })
 
 
 @router.get("", response_model=dict)
@@ -137,24 +156,22 @@ async def list_resume_metadata(
     profileId: Optional[str] = Query(None, description="Filter by profile ID"),
     isActive: Optional[bool] = Query(None, description="Filter by active status"),
     isPrimary: Optional[bool] = Query(None, description="Filter by primary status"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor returned as nextCursor by the previous page"),
+    limit: int = Query(50, ge=1, le=200, description="Items per page"),
     current_user: dict = Depends(get_current_user)
 ):
-    """List resume metadata with filters"""
+    """List resume metadata with filters and pagination"""
     db = get_database()
     
     # Build query
     query = {}
     
     if profileId:
-        if not ObjectId.is_valid(profileId):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid profile ID format"
-            )
-        query["profileId"] = ObjectId(profileId)
+        profile_oid = parse_object_id("profile ID", profileId)
+        query["profileId"] = profile_oid
         
         # Verify profile exists and check authorization
-        profile = await db.candidate_profiles.find_one({"_id": ObjectId(profileId)})
+        profile = await db.candidate_profiles.find_one({"_id": profile_oid}, projection={"userId": 1})
         
         if not profile:
             raise HTTPException(
@@ -181,16 +198,35 @@ async def list_resume_metadata(
     if isPrimary is not None:
         query["isPrimary"] = isPrimary
     
-    # Get resumes
-    cursor = db.resume_metadata.find(query).sort("uploadedAt", -1)
-    resumes = await cursor.to_list(length=None)
+    # Keyset pagination on (uploadedAt, _id)
+    if cursor:
+        try:
+            query.update(keyset_filter(cursor, field="uploadedAt"))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+    
+    # Get resumes, one extra document tells whether another page exists
+    # and a matching batch size returns the whole page in a single server round-trip
+    resumes_cursor = db.resume_metadata.find(query).sort(_SORT_UPLOADED_DESC).limit(limit + 1).batch_size(limit + 1)
+    resumes = await resumes_cursor.to_list(length=limit + 1)
+    has_more = len(resumes) > limit
+    resumes = resumes[:limit]
     
-    return {
+    # Documents are serialized as-is, ObjectIds are stringified by the response encoder
+    return MongoJSONResponse({
         "success": True,
         "data": {
-            "resumes": [ResumeMetadata.resume_to_dict(resume) for resume in resumes]
+            "resumes": resumes,
+            "pagination": build_pagination(
+                limit,
+                has_more,
+                next_cursor=encode_cursor(resumes[-1], field="uploadedAt") if has_more else None
+            )
         }
-    }
+    })
 
 
 @router.put("/{resume_id}", response_model=dict)
@@ -203,13 +239,8 @@ async def update_resume_metadata(
     """Update resume metadata"""
     db = get_database()
     
-    if not ObjectId.is_valid(resume_id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid resume ID format"
-        )
-    
-    resume = await db.resume_metadata.find_one({"_id": ObjectId(resume_id)})
+    resume_oid = parse_object_id("resume ID", resume_id)
+    resume, profile = await _find_resume_with_profile(db, resume_oid, projection={"profileId": 1})
     
     if not resume:
         raise HTTPException(
@@ -217,9 +248,6 @@ async def update_resume_metadata(
             detail="Resume not found"
         )
     
-    # Get associated profile for authorization check
-    profile = await db.candidate_profiles.find_one({"_id": resume.get("profileId")})
-    
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -245,32 +273,32 @@ async def update_resume_metadata(
         await db.resume_metadata.update_many(
             {
                 "profileId": resume.get("profileId"),
-                "_id": {"$ne": ObjectId(resume_id)},
-                "isActive": True
+                "_id": {"$ne": resume_oid},
+                "isActive": True,
+                "isPrimary": True
             },
             {"$set": {"isPrimary": False}}
         )
     
     # Prepare update
     if update_data:
-        update_data["updatedAt"] = datetime.utcnow()
-        await db.resume_metadata.update_one(
-            {"_id": ObjectId(resume_id)},
-            {"$set": update_data}
+        updated_resume = await db.resume_metadata.find_one_and_update(
+            {"_id": resume_oid},
+            {"$set": update_data, "$currentDate": {"updatedAt": True}},
+            return_document=ReturnDocument.AFTER
         )
         
         logger.info(f"Resume metadata updated: {resume_id} by {current_user['_id']}")
+    else:
+        updated_resume = await db.resume_metadata.find_one({"_id": resume_oid})
     
-    # Get updated resume
-    updated_resume = await db.resume_metadata.find_one({"_id": ObjectId(resume_id)})
-    
-    return {
+    return MongoJSONResponse({
         "success": True,
         "message": "Resume metadata updated successfully",
         "data": {
-            "resume": ResumeMetadata.resume_to_dict(updated_resume)
+            "resume": updated_resume
         }
-    }
+    })
 
 
 @router.delete("/{resume_id}", response_model=dict)
@@ -282,13 +310,8 @@ async def delete_resume_metadata(
     """Soft delete resume metadata (set isActive to False)"""
     db = get_database()
     
-    if not ObjectId.is_valid(resume_id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid resume ID format"
-        )
-    
-    resume = await db.resume_metadata.find_one({"_id": ObjectId(resume_id)})
+    resume_oid = parse_object_id("resume ID", resume_id)
+    resume, profile = await _find_resume_with_profile(db, resume_oid, projection={"profileId": 1})
     
     if not resume:
         raise HTTPException(
@@ -296,9 +319,6 @@ async def delete_resume_metadata(
             detail="Resume not found"
         )
     
-    # Get associated profile for authorization check
-    profile = await db.candidate_profiles.find_one({"_id": resume.get("profileId")})
-    
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -320,14 +340,14 @@ async def delete_resume_metadata(
     
     # Soft delete
     await db.resume_metadata.update_one(
-        {"_id": ObjectId(resume_id)},
-        {"$set": {"isActive": False, "updatedAt": datetime.utcnow()}}
+        {"_id": resume_oid},
+        {"$set": {"isActive": False}, "$currentDate": {"updatedAt": True}}
     )
     
     logger.info(f"Resume metadata deleted: {resume_id} by {current_user['_id']}")
     
-    return {
+    return MongoJSONResponse({
         "success": True,
         "message": "Resume metadata deleted successfully"
-    }
+    })
 
@@ -1,35 +1,55 @@
 """
 Database configuration and connection management
 """
+import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import OperationFailure
 from src.config.settings import settings
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Server error code for dropping an index that does not exist
+_INDEX_NOT_FOUND = 27
+
 # Global database client
 client: AsyncIOMotorClient = None
 database = None
 
 
+def create_client() -> AsyncIOMotorClient:
+    """Create a MongoDB client with the service's pool and wire settings"""
+    return AsyncIOMotorClient(
+        settings.MONGODB_URI,
+        serverSelectionTimeoutMS=3000,
+        maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,  # Maximum number of connections in the pool
+        minPoolSize=settings.MONGODB_MIN_POOL_SIZE,  # Connections kept open even when idle
+        maxIdleTimeMS=30000,  # Close idle connections after 30 seconds
+        waitQueueTimeoutMS=5000,  # Fail fast instead of queueing forever when the pool is exhausted
+        connectTimeoutMS=10000,  # Time to wait for connection
+        socketTimeoutMS=30000,  # Time to wait for socket operations
+        compressors=settings.MONGODB_COMPRESSORS,  # Negotiated in order, first one the server supports wins
+        zlibCompressionLevel=-1,
+        retryWrites=True,
+        readPreference="primaryPreferred",
+    )
+
+
 async def connect_db():
     """Connect to MongoDB"""
     global client, database
     
     try:
-        client = AsyncIOMotorClient(
-            settings.MONGODB_URI,
-            serverSelectionTimeoutMS=5000,
-            maxPoolSize=20,  # Maximum number of connections in the pool
-            minPoolSize=1,  # Minimum number of connections (start with 1, grow as needed)
-            maxIdleTimeMS=30000,  # Close idle connections after 30 seconds
-            connectTimeoutMS=10000,  # Time to wait for connection
-            socketTimeoutMS=30000,  # Time to wait for socket operations
-        )
+        client = create_client()
         
         # Test connection
         await client.admin.command('ping')
         
+        # Warm the pool with concurrent pings so early requests don't pay the connection handshake
+        await asyncio.gather(
+            *(client.admin.command('ping') for _ in range(settings.MONGODB_MIN_POOL_SIZE))
+        )
+        
         db_name = settings.MONGODB_DATABASE
         database = client[db_name]
         
@@ -57,13 +77,20 @@ async def create_indexes():
     try:
         # Candidate profile indexes
         await database.candidate_profiles.create_index("userId", unique=True)
-        await database.candidate_profiles.create_index([("organizationId", 1), ("createdAt", -1)])
+        await database.candidate_profiles.create_index([("organizationId", 1), ("createdAt", -1), ("_id", -1)])
+        # The keyset index above supersedes the old (organizationId, createdAt) one, which would only cost writes
+        try:
+            await database.candidate_profiles.drop_index("organizationId_1_createdAt_-1")
+        except OperationFailure as e:
+            if e.code != _INDEX_NOT_FOUND:
+                raise
         await database.candidate_profiles.create_index("skills")
         await database.candidate_profiles.create_index("location")
         await database.candidate_profiles.create_index("isActive")
         
         # Resume metadata indexes
         await database.resume_metadata.create_index([("profileId", 1), ("isActive", 1)])
+        await database.resume_metadata.create_index([("profileId", 1), ("isPrimary", 1), ("isActive", 1)])
         await database.resume_metadata.create_index("s3Key", unique=True)
         await database.resume_metadata.create_index([("uploadedAt", -1)])
         
@@ -85,17 +112,7 @@ def get_database():
     if database is None:
         # Lazy initialisation – primarily for tests
         try:
-            from motor.motor_asyncio import AsyncIOMotorClient  # local import to avoid cycles
-
-            client = AsyncIOMotorClient(
-                settings.MONGODB_URI,
-                serverSelectionTimeoutMS=5000,
-                maxPoolSize=20,
-                minPoolSize=1,
-                maxIdleTimeMS=30000,
-                connectTimeoutMS=10000,
-                socketTimeoutMS=30000,
-            )
+            client = create_client()
             db_name = (
                 settings.MONGODB_TEST_DATABASE
                 if settings.ENVIRONMENT.lower() == "test"
@@ -19,6 +19,9 @@ class Settings(BaseSettings):
     MONGODB_URI: str = "mongodb://localhost:27017"
     MONGODB_DATABASE: str = "matchtal_profiles"
     MONGODB_TEST_DATABASE: str = "matchtal_profiles_test"
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 10
+    MONGODB_COMPRESSORS: str = "zstd,zlib"
     
     # JWT Configuration (shared with auth-service)
     JWT_SECRET_KEY: str = "your-super-secret-jwt-key-change-in-production-min-32-chars"
@@ -30,6 +33,7 @@ class Settings(BaseSettings):
     
     # Security
     RATE_LIMIT_PER_MINUTE: int = 100
+    REDIS_URL: str = ""  # e.g. redis://redis:6379/1, shared rate limit storage across workers
     
     # CORS
     CORS_ORIGINS: List[str] = ["*"]
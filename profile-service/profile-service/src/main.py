@@ -11,6 +11,7 @@ from src.api.v1.routes import profiles, resumes
 from slowapi.errors import RateLimitExceeded
 from src.middleware.rate_limiter import rate_limiter
 from src.utils.logger import setup_logger
+from src.utils.serialization import MongoJSONResponse
 
 logger = setup_logger(__name__)
 
@@ -35,14 +36,15 @@ app = FastAPI(
     version=settings.APP_VERSION,
     description="Candidate Profile and Resume Management Microservice for MatchTal AI Recruitment Platform",
     lifespan=lifespan,
+    default_response_class=MongoJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc"
 )
 
-# CORS middleware
+# CORS middleware (origins as a frozenset so the per-request origin check is a hash lookup)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
+    allow_origins=frozenset(settings.CORS_ORIGINS),
     allow_credentials=settings.CORS_CREDENTIALS,
     allow_methods=["*"],
     allow_headers=["*"],
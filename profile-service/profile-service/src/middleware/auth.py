@@ -3,13 +3,20 @@ Authentication middleware - validates JWT tokens from auth-service
 """
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from src.utils.jwt import verify_token
+from cachetools import TTLCache
+from src.utils.jwt import decode_and_cache_token, get_cached_payload, token_cache_key
 from src.utils.logger import setup_logger
+import asyncio
 import httpx
 
 logger = setup_logger(__name__)
 security = HTTPBearer()
 
+# Resolved user dicts keyed by token hash, so bursts of requests with the same token share
+# one dict. Keyed by the whole token since two tokens for the same subject can be issued in
+# the same second with different claims. Tokens are still verified on every request.
+_user_cache = TTLCache(maxsize=5000, ttl=60)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
@@ -18,10 +25,21 @@ async def get_current_user(
     token = credentials.credentials
     
     try:
-        # Verify token locally (shared secret with auth-service)
-        payload = verify_token(token)
+        # Verify token locally (shared secret with auth-service). The token is hashed once for both
+        # caches; cache hits are served on the event loop, cold verifications run in the threadpool
+        # so signature checks don't block it
+        cache_key = token_cache_key(token)
+        payload = get_cached_payload(cache_key)
+        if payload is None:
+            payload = await asyncio.get_running_loop().run_in_executor(
+                None, decode_and_cache_token, token, cache_key
+            )
         user_id = payload.get("sub") or payload.get("userId")
         
+        user = _user_cache.get(cache_key)
+        if user is not None:
+            return user
+        
         if not user_id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -36,6 +54,7 @@ async def get_current_user(
             "organizationId": payload.get("organizationId"),
             "isActive": payload.get("isActive", True)
         }
+        _user_cache[cache_key] = user
         
         return user
         
@@ -55,13 +74,14 @@ async def get_current_user(
 
 def require_roles(*allowed_roles: str):
     """Dependency to check user roles"""
+    allowed = frozenset(allowed_roles)
+    detail = f"Insufficient permissions. Required role(s): {', '.join(allowed_roles)}"
+    
     async def role_checker(current_user: dict = Depends(get_current_user)) -> dict:
-        user_role = current_user.get("role")
-        
-        if user_role not in allowed_roles:
+        if current_user.get("role") not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Insufficient permissions. Required role(s): {', '.join(allowed_roles)}"
+                detail=detail
             )
         
         return current_user
@@ -70,7 +90,11 @@ def require_roles(*allowed_roles: str):
 
 
 def check_organization_access(current_user: dict, requested_org_id: str = None) -> bool:
-    """Check if user has access to organization data"""
+    """Check if user has access to organization data.
+
+    Organization IDs are compared as the canonical 24-hex strings carried in the token,
+    so callers pass requested_org_id as a string.
+    """
     user_role = current_user.get("role")
     user_org_id = current_user.get("organizationId")
     
@@ -80,13 +104,13 @@ def check_organization_access(current_user: dict, requested_org_id: str = None)
     
     # Employer admins can access all data in their organization
     if user_role == "employer_admin":
-        if requested_org_id and str(user_org_id) != str(requested_org_id):
+        if requested_org_id and user_org_id != requested_org_id:
             return False
         return True
     
     # Recruiters can access data in their organization
     if user_role == "recruiter":
-        if requested_org_id and str(user_org_id) != str(requested_org_id):
+        if requested_org_id and user_org_id != requested_org_id:
             return False
         return True
     
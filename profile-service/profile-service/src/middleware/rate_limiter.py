@@ -6,8 +6,13 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from src.config.settings import settings
 
-# Create rate limiter
-rate_limiter = Limiter(key_func=get_remote_address)
+# Create rate limiter. Counters are kept in Redis when configured so limits hold across
+# workers and instances, otherwise in process memory (local development and tests).
+rate_limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=settings.REDIS_URL or "memory://",
+    strategy="moving-window"
+)
 
 
 
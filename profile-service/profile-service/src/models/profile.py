@@ -1,27 +1,44 @@
 """
 Candidate profile model and schema
 """
+import re
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, Field, EmailStr, field_validator
+from typing import Annotated, Any, Optional, List
+from pydantic import (
+    BaseModel, Field, PlainSerializer, PlainValidator, StringConstraints, WithJsonSchema, field_validator
+)
 from bson import ObjectId
 
+# Structural email check, compiled once into the model's core schema
+_EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
 
-class PyObjectId(ObjectId):
-    """Custom ObjectId for Pydantic"""
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
+Email = Annotated[str, StringConstraints(strip_whitespace=True, max_length=320, pattern=_EMAIL_PATTERN)]
 
-    @classmethod
-    def validate(cls, v):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid ObjectId")
+# Individual skill entries are length-bounded in the list's core schema
+Skill = Annotated[str, StringConstraints(min_length=1, max_length=50)]
+
+
+_OBJECT_ID_RE = re.compile(r"[0-9a-fA-F]{24}")
+
+
+def validate_object_id(v: Any) -> ObjectId:
+    """Validate and convert a value to ObjectId"""
+    if isinstance(v, ObjectId):
+        return v
+    if isinstance(v, str) and _OBJECT_ID_RE.fullmatch(v):
         return ObjectId(v)
+    if isinstance(v, bytes) and len(v) == 12:
+        return ObjectId(v)
+    raise ValueError("Invalid ObjectId")
 
-    @classmethod
-    def __get_pydantic_json_schema__(cls, field_schema):
-        field_schema.update(type="string")
+
+# ObjectId field type for Pydantic, validated as a plain function in the core schema
+PyObjectId = Annotated[
+    ObjectId,
+    PlainValidator(validate_object_id),
+    PlainSerializer(lambda v: str(v), return_type=str),
+    WithJsonSchema({"type": "string"}),
+]
 
 
 class Experience(BaseModel):
@@ -60,11 +77,11 @@ class ProfileBase(BaseModel):
     """Base profile schema"""
     firstName: str = Field(..., min_length=1, max_length=100)
     lastName: str = Field(..., min_length=1, max_length=100)
-    email: EmailStr
+    email: Email
     phone: Optional[str] = Field(None, max_length=20)
     location: Optional[str] = Field(None, max_length=200)
     summary: Optional[str] = Field(None, max_length=2000)
-    skills: List[str] = Field(default_factory=list, max_length=100)
+    skills: List[Skill] = Field(default_factory=list, max_length=100)
     experience: List[Experience] = Field(default_factory=list)
     education: List[Education] = Field(default_factory=list)
     linkedInUrl: Optional[str] = Field(None, max_length=500)
@@ -86,7 +103,7 @@ class ProfileUpdate(BaseModel):
     phone: Optional[str] = Field(None, max_length=20)
     location: Optional[str] = Field(None, max_length=200)
     summary: Optional[str] = Field(None, max_length=2000)
-    skills: Optional[List[str]] = Field(None, max_length=100)
+    skills: Optional[List[Skill]] = Field(None, max_length=100)
     experience: Optional[List[Experience]] = None
     education: Optional[List[Education]] = None
     linkedInUrl: Optional[str] = Field(None, max_length=500)
@@ -107,28 +124,3 @@ class ProfileResponse(ProfileBase):
     class Config:
         populate_by_name = True
         from_attributes = True
-
-
-class Profile:
-    """Profile model for database operations"""
-    
-    @staticmethod
-    def profile_to_dict(profile: dict) -> dict:
-        """Convert profile document to dict"""
-        profile_dict = profile.copy()
-        profile_dict['_id'] = str(profile_dict['_id'])
-        
-        # Convert userId ObjectId to string if present
-        if profile_dict.get('userId') and isinstance(profile_dict['userId'], ObjectId):
-            profile_dict['userId'] = str(profile_dict['userId'])
-        
-        # Convert organizationId ObjectId to string if present
-        if profile_dict.get('organizationId') and isinstance(profile_dict['organizationId'], ObjectId):
-            profile_dict['organizationId'] = str(profile_dict['organizationId'])
-        
-        return profile_dict
-
-
-
-
-
@@ -4,7 +4,6 @@ Resume metadata model and schema
 from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, Field
-from bson import ObjectId
 
 
 class ResumeMetadataBase(BaseModel):
@@ -42,24 +41,3 @@ class ResumeMetadataResponse(ResumeMetadataBase):
     class Config:
         populate_by_name = True
         from_attributes = True
-
-
-class ResumeMetadata:
-    """Resume metadata model for database operations"""
-    
-    @staticmethod
-    def resume_to_dict(resume: dict) -> dict:
-        """Convert resume document to dict"""
-        resume_dict = resume.copy()
-        resume_dict['_id'] = str(resume_dict['_id'])
-        
-        # Convert profileId ObjectId to string if present
-        if resume_dict.get('profileId') and isinstance(resume_dict['profileId'], ObjectId):
-            resume_dict['profileId'] = str(resume_dict['profileId'])
-        
-        return resume_dict
-
-
-
-
-
@@ -1,23 +1,94 @@
 """
 JWT token utilities for validating tokens from auth-service
 """
-from typing import Dict
-from jose import JWTError, jwt
+import base64
+import hashlib
+import hmac
+import threading
+import time
+from typing import Dict, Optional
+import jwt
+import orjson
+from cachetools import TLRUCache
+from jwt.exceptions import InvalidTokenError
 from src.config.settings import settings
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+TOKEN_ISSUER = "matchtal-auth-service"
+TOKEN_AUDIENCE = "matchtal-platform"
+_REQUIRED_CLAIMS = ("exp", "iat", "type")
+_SECRET_KEY = settings.JWT_SECRET_KEY.encode()
+
+# Upper bound on how long a verified payload is reused, entries also expire at the token's exp
+TOKEN_CACHE_TTL_SECONDS = 30
+
+
+def _token_cache_ttu(key: str, payload: Dict, now: float) -> float:
+    """Expire cached payloads after the cache TTL or at the token's own exp, whichever is first"""
+    return min(now + TOKEN_CACHE_TTL_SECONDS, payload["exp"])
+
+
+# Verified payloads keyed by token hash (raw tokens are never stored). Failed
+# verifications are not cached. Guarded by a lock since verify_token may run in a threadpool.
+_token_cache = TLRUCache(maxsize=10_000, ttu=_token_cache_ttu, timer=time.time)
+_token_cache_lock = threading.Lock()
+
+
+def token_cache_key(token: str) -> str:
+    """Hash identifying a token, used to key the token and resolved-user caches"""
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+def get_cached_payload(cache_key: str) -> Optional[Dict]:
+    """Return the cached payload of a recently verified token, looked up by its token_cache_key, or None"""
+    with _token_cache_lock:
+        payload = _token_cache.get(cache_key)
+    
+    # Re-check exp on hit so an expired token is never served from the cache
+    if payload is not None and payload["exp"] > time.time():
+        return payload
+    return None
+
+
+def decode_and_cache_token(token: str, cache_key: str) -> Dict:
+    """Verify a token that missed the cache and cache its payload under cache_key"""
+    payload = _decode_token(token)
+    if "exp" in payload:
+        with _token_cache_lock:
+            _token_cache[cache_key] = payload
+    
+    return payload
+
 
 def verify_token(token: str) -> Dict:
-    """Verify and decode JWT token from auth-service"""
+    """Verify and decode JWT token from auth-service, reusing recently verified payloads"""
+    cache_key = token_cache_key(token)
+    payload = get_cached_payload(cache_key)
+    if payload is not None:
+        return payload
+    
+    return decode_and_cache_token(token, cache_key)
+
+
+def _decode_token(token: str) -> Dict:
+    """Verify signature and claims of a JWT token from auth-service"""
+    if settings.JWT_ALGORITHM == "HS256":
+        try:
+            return verify_hs256_token(token.encode(), _SECRET_KEY)
+        except ValueError as e:
+            logger.error(f"JWT verification error: {e}")
+            raise
+    
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM],
-            issuer="matchtal-auth-service",
-            audience="matchtal-platform"
+            issuer=TOKEN_ISSUER,
+            audience=TOKEN_AUDIENCE,
+            options={"require": list(_REQUIRED_CLAIMS)}
         )
         
         # Verify it's an access token
@@ -25,11 +96,66 @@ def verify_token(token: str) -> Dict:
             raise ValueError("Token is not an access token")
         
         return payload
-    except JWTError as e:
+    except InvalidTokenError as e:
         logger.error(f"JWT verification error: {e}")
         raise ValueError(f"Invalid token: {str(e)}")
 
 
+def _b64decode(segment: bytes) -> bytes:
+    """Decode an unpadded base64url JWT segment"""
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
 
 
-
+def verify_hs256_token(token: bytes, key: bytes) -> Dict:
+    """Verify an HS256 token with hmac/orjson directly, applying the same checks as _decode_token"""
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(b".")
+        header = orjson.loads(_b64decode(header_b64))
+        signature = _b64decode(signature_b64)
+    except ValueError:
+        raise ValueError("Invalid token: Not enough segments or invalid encoding")
+    
+    if not isinstance(header, dict) or header.get("alg") != "HS256":
+        raise ValueError("Invalid token: The specified alg value is not allowed")
+    
+    expected = hmac.new(key, header_b64 + b"." + payload_b64, hashlib.sha256).digest()
+    if not hmac.compare_digest(expected, signature):
+        raise ValueError("Invalid token: Signature verification failed")
+    
+    try:
+        payload = orjson.loads(_b64decode(payload_b64))
+    except ValueError:
+        raise ValueError("Invalid token: Invalid payload string")
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid token: Invalid payload string: must be a json object")
+    
+    for claim in _REQUIRED_CLAIMS:
+        if payload.get(claim) is None:
+            raise ValueError(f'Invalid token: Token is missing the "{claim}" claim')
+    
+    now = time.time()
+    for claim in ("exp", "iat", "nbf"):
+        value = payload.get(claim)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"Invalid token: The {claim} claim must be a number")
+    if payload["exp"] <= now:
+        raise ValueError("Invalid token: Signature has expired")
+    if payload["iat"] > now:
+        raise ValueError("Invalid token: The token is not yet valid (iat)")
+    if payload.get("nbf") is not None and payload["nbf"] > now:
+        raise ValueError("Invalid token: The token is not yet valid (nbf)")
+    
+    if payload.get("iss") != TOKEN_ISSUER:
+        raise ValueError("Invalid token: Invalid issuer")
+    
+    audience = payload.get("aud")
+    if audience is None:
+        raise ValueError('Invalid token: Token is missing the "aud" claim')
+    if audience != TOKEN_AUDIENCE and not (isinstance(audience, list) and TOKEN_AUDIENCE in audience):
+        raise ValueError("Invalid token: Invalid audience")
+    
+    # Verify it's an access token
+    if payload["type"] != "access":
+        raise ValueError("Token is not an access token")
+    
+    return payload
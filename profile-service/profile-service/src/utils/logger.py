@@ -3,37 +3,36 @@ Logging configuration
 """
 import logging
 import sys
+from functools import lru_cache
 from pythonjsonlogger import jsonlogger
 from src.config.settings import settings
 
+# Level and formatter are resolved once and shared by every logger
+_LEVEL = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
 
+# Set formatter based on LOG_FORMAT
+if settings.LOG_FORMAT == "json":
+    _FORMATTER = jsonlogger.JsonFormatter(
+        '%(asctime)s %(name)s %(levelname)s %(message)s'
+    )
+else:
+    _FORMATTER = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+
+@lru_cache(maxsize=None)
 def setup_logger(name: str) -> logging.Logger:
-    """Setup logger with JSON formatting"""
+    """Setup logger with JSON formatting (configured once per name)"""
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO))
+    logger.setLevel(_LEVEL)
     
     # Remove existing handlers
     logger.handlers = []
     
     # Create handler
     handler = logging.StreamHandler(sys.stdout)
-    
-    # Set formatter based on LOG_FORMAT
-    if settings.LOG_FORMAT == "json":
-        formatter = jsonlogger.JsonFormatter(
-            '%(asctime)s %(name)s %(levelname)s %(message)s'
-        )
-    else:
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-    
-    handler.setFormatter(formatter)
+    handler.setFormatter(_FORMATTER)
     logger.addHandler(handler)
     
     return logger
-
-
-
-
-
@@ -0,0 +1,17 @@
+"""
+ObjectId parsing helpers for request input
+"""
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, status
+
+
+def parse_object_id(name: str, value: str) -> ObjectId:
+    """Convert a request value to an ObjectId, raising 400 if it is malformed"""
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {name} format"
+        )
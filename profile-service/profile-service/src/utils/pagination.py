@@ -0,0 +1,48 @@
+"""
+Keyset (cursor) pagination helpers
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+def encode_cursor(doc: dict, field: str = "createdAt") -> str:
+    """Encode the (timestamp, _id) position of a document into an opaque cursor"""
+    raw = json.dumps({"t": doc[field].isoformat(), "i": str(doc["_id"])})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Decode an opaque cursor back into its (timestamp, _id) position"""
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(raw["t"]), ObjectId(raw["i"])
+    except (ValueError, TypeError, KeyError, InvalidId) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def keyset_filter(cursor: str, field: str = "createdAt") -> dict:
+    """Build the filter selecting documents after a cursor in descending (field, _id) order"""
+    last_value, last_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {field: {"$lt": last_value}},
+            {field: last_value, "_id": {"$lt": last_id}}
+        ]
+    }
+
+
+def build_pagination(limit: int, has_more: bool, next_cursor: Optional[str] = None, total: Optional[int] = None) -> dict:
+    """Build the pagination block of a list response, with total/pages only when counted"""
+    if total is None:
+        return {"limit": limit, "hasMore": has_more, "nextCursor": next_cursor}
+    return {
+        "limit": limit,
+        "hasMore": has_more,
+        "nextCursor": next_cursor,
+        "total": total,
+        "pages": (total + limit - 1) // limit
+    }
@@ -0,0 +1,27 @@
+"""
+JSON serialization for MongoDB documents
+"""
+from typing import Any
+import orjson
+from bson import ObjectId
+from fastapi.responses import ORJSONResponse
+
+
+def orjson_default(obj: Any) -> Any:
+    """Serialize BSON types orjson does not handle natively"""
+    if isinstance(obj, ObjectId):
+        # Hex of the raw 12 bytes, same output as str(obj) without the Python-level wrapper
+        return obj.binary.hex()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class MongoJSONResponse(ORJSONResponse):
+    """JSON response that serializes raw MongoDB documents in a single orjson pass"""
+
+    def render(self, content: Any) -> bytes:
+        # MongoDB returns naive datetimes that are UTC, so they are tagged as such and rendered with a Z suffix
+        return orjson.dumps(
+            content,
+            default=orjson_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+        )
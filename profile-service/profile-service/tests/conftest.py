@@ -1,8 +1,12 @@
 """
 Pytest configuration and fixtures
 """
+import asyncio
+from datetime import datetime, timedelta, timezone
+import jwt
 import pytest
-from fastapi.testclient import TestClient
+from bson import ObjectId
+from httpx import AsyncClient, ASGITransport
 from motor.motor_asyncio import AsyncIOMotorClient
 from src.main import app
 from src.config.database import get_database, connect_db, close_db
@@ -10,10 +14,38 @@ from src.config.settings import settings
 import os
 
 
+def make_token(**overrides):
+    """Create an access token signed with the shared secret"""
+    user_id = str(ObjectId())
+    token_data = {
+        "sub": user_id,
+        "userId": user_id,
+        "email": "john@example.com",
+        "role": "candidate",
+        "isActive": True,
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=60),
+        "iat": datetime.now(timezone.utc),
+        "iss": "matchtal-auth-service",
+        "aud": "matchtal-platform",
+        "type": "access"
+    }
+    token_data.update(overrides)
+    return jwt.encode(token_data, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Share one event loop across the session so session-scoped async fixtures can use it"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
 @pytest.fixture(scope="session")
-def test_client():
-    """Create test client"""
-    return TestClient(app)
+async def test_client():
+    """Create an in-process async test client bound to the ASGI app"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
 
 
 @pytest.fixture(scope="function")
@@ -40,8 +72,9 @@ async def test_db():
 async def sample_profile(test_db):
     """Create a sample profile for testing"""
     from bson import ObjectId
-    from datetime import datetime
+    from datetime import datetime, timezone
     
+    now = datetime.now(timezone.utc)
     profile_doc = {
         "userId": ObjectId(),
         "firstName": "John",
@@ -54,8 +87,8 @@ async def sample_profile(test_db):
         "experience": [],
         "education": [],
         "isActive": True,
-        "createdAt": datetime.utcnow(),
-        "updatedAt": datetime.utcnow()
+        "createdAt": now,
+        "updatedAt": now
     }
     
     result = await test_db.candidate_profiles.insert_one(profile_doc)
@@ -68,8 +101,9 @@ async def sample_profile(test_db):
 async def sample_resume(test_db, sample_profile):
     """Create a sample resume metadata for testing"""
     from bson import ObjectId
-    from datetime import datetime
+    from datetime import datetime, timezone
     
+    now = datetime.now(timezone.utc)
     resume_doc = {
         "profileId": sample_profile["_id"],
         "fileName": "resume.pdf",
@@ -79,8 +113,8 @@ async def sample_resume(test_db, sample_profile):
         "s3Bucket": "matchtal-resumes",
         "isActive": True,
         "isPrimary": True,
-        "uploadedAt": datetime.utcnow(),
-        "updatedAt": datetime.utcnow()
+        "uploadedAt": now,
+        "updatedAt": now
     }
     
     result = await test_db.resume_metadata.insert_one(resume_doc)
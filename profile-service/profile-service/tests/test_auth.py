@@ -0,0 +1,96 @@
+"""
+Tests for the authentication middleware
+"""
+import pytest
+from datetime import datetime, timezone
+from bson import ObjectId
+import src.middleware.auth as auth
+import src.utils.jwt as jwt_utils
+from tests.conftest import make_token
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    """Start every test with empty token and resolved-user caches"""
+    jwt_utils._token_cache.clear()
+    auth._user_cache.clear()
+    yield
+    jwt_utils._token_cache.clear()
+    auth._user_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_cold_token_hashed_and_decoded_once(monkeypatch):
+    """Test that a cache miss hashes the token once and decodes it once in the threadpool"""
+    from fastapi.security import HTTPAuthorizationCredentials
+    
+    token = make_token()
+    hashed, decoded = [], []
+    
+    def record_hash(token):
+        hashed.append(token)
+        return jwt_utils.token_cache_key(token)
+    
+    def record_decode(token):
+        decoded.append(token)
+        return real_decode(token)
+    
+    real_decode = jwt_utils._decode_token
+    monkeypatch.setattr(auth, "token_cache_key", record_hash)
+    monkeypatch.setattr(jwt_utils, "_decode_token", record_decode)
+    
+    user = await auth.get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+    assert user["role"] == "candidate"
+    assert hashed == [token]
+    assert decoded == [token]
+    assert jwt_utils.get_cached_payload(jwt_utils.token_cache_key(token)) is not None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_distinguishes_tokens_issued_together():
+    """Test that tokens sharing subject and issue time resolve to their own claims"""
+    from fastapi.security import HTTPAuthorizationCredentials
+    from src.middleware.auth import get_current_user
+    
+    user_id = str(ObjectId())
+    issued_at = int(datetime.now(timezone.utc).timestamp())
+    
+    def make_credentials(role, organization_id):
+        token = make_token(sub=user_id, userId=user_id, role=role, organizationId=organization_id, iat=issued_at)
+        return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    
+    org_a, org_b = str(ObjectId()), str(ObjectId())
+    recruiter = await get_current_user(make_credentials("recruiter", org_a))
+    admin = await get_current_user(make_credentials("employer_admin", org_b))
+    
+    assert (recruiter["role"], recruiter["organizationId"]) == ("recruiter", org_a)
+    assert (admin["role"], admin["organizationId"]) == ("employer_admin", org_b)
+
+
+@pytest.mark.asyncio
+async def test_require_roles():
+    """Test role checking dependency"""
+    from fastapi import HTTPException
+    from src.middleware.auth import require_roles
+    
+    role_checker = require_roles("recruiter", "employer_admin")
+    user = {"_id": str(ObjectId()), "role": "recruiter"}
+    assert await role_checker(current_user=user) is user
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await role_checker(current_user={"_id": str(ObjectId()), "role": "candidate"})
+    assert exc_info.value.status_code == 403
+    assert exc_info.value.detail == "Insufficient permissions. Required role(s): recruiter, employer_admin"
+
+
+def test_check_organization_access():
+    """Test organization access for recruiters and admins"""
+    from src.middleware.auth import check_organization_access
+    
+    org_id = str(ObjectId())
+    recruiter = {"_id": str(ObjectId()), "role": "recruiter", "organizationId": org_id}
+    
+    assert check_organization_access(recruiter, org_id)
+    assert check_organization_access(recruiter, None)
+    assert not check_organization_access(recruiter, str(ObjectId()))
+    assert not check_organization_access({"role": "unknown"}, org_id)
@@ -0,0 +1,84 @@
+"""
+Tests for JWT token verification
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+import jwt
+from src.config.settings import settings
+import src.utils.jwt as jwt_utils
+from tests.conftest import make_token
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Start every test with an empty token cache"""
+    jwt_utils._token_cache.clear()
+    yield
+    jwt_utils._token_cache.clear()
+
+
+def test_verify_token_caches_payload(monkeypatch):
+    """Test that a verified token is not decoded again"""
+    token = make_token()
+    payload = jwt_utils.verify_token(token)
+    
+    def fail_decode(token):
+        raise AssertionError("token should have been served from cache")
+    
+    monkeypatch.setattr(jwt_utils, "_decode_token", fail_decode)
+    assert jwt_utils.verify_token(token) is payload
+
+
+def test_verify_token_does_not_cache_failures():
+    """Test that invalid tokens are rejected and never cached"""
+    token = make_token(type="refresh")
+    
+    with pytest.raises(ValueError):
+        jwt_utils.verify_token(token)
+    assert len(jwt_utils._token_cache) == 0
+
+
+def test_verify_token_rejects_expired_cached_payload(monkeypatch):
+    """Test that a cached payload past its exp is verified again instead of served"""
+    token = make_token()
+    payload = jwt_utils.verify_token(token)
+    decoded = []
+    
+    def record_decode(token):
+        decoded.append(token)
+        raise ValueError("Invalid token: Signature has expired.")
+    
+    monkeypatch.setattr(jwt_utils, "_decode_token", record_decode)
+    monkeypatch.setattr(jwt_utils.time, "time", lambda: payload["exp"] + 1)
+    with pytest.raises(ValueError):
+        jwt_utils.verify_token(token)
+    assert decoded == [token]
+
+
+def test_verify_hs256_token_matches_pyjwt():
+    """Test that the HS256 fast path accepts what PyJWT accepts"""
+    token = make_token()
+    expected = jwt.decode(
+        token,
+        settings.JWT_SECRET_KEY,
+        algorithms=["HS256"],
+        issuer="matchtal-auth-service",
+        audience="matchtal-platform"
+    )
+    
+    assert jwt_utils.verify_hs256_token(token.encode(), settings.JWT_SECRET_KEY.encode()) == expected
+
+
+@pytest.mark.parametrize("token", [
+    make_token(exp=datetime.now(timezone.utc) - timedelta(minutes=1)),
+    make_token(aud="another-platform"),
+    make_token(iss="another-issuer"),
+    make_token(type="refresh"),
+    jwt.encode({"sub": "user", "exp": datetime.now(timezone.utc) + timedelta(minutes=5)}, "wrong-secret", algorithm="HS256"),
+    jwt.encode({"sub": "user"}, None, algorithm="none"),
+    "not.a-token",
+])
+def test_verify_hs256_token_rejects_invalid(token):
+    """Test that the HS256 fast path rejects invalid tokens"""
+    with pytest.raises(ValueError):
+        jwt_utils.verify_hs256_token(token.encode(), settings.JWT_SECRET_KEY.encode())
@@ -2,20 +2,22 @@
 Tests for profile endpoints
 """
 import pytest
-from fastapi.testclient import TestClient
 from bson import ObjectId
 from datetime import datetime
+from tests.conftest import make_token
 
 
-def test_health_check(test_client):
+@pytest.mark.asyncio
+async def test_health_check(test_client):
     """Test health check endpoint"""
-    response = test_client.get("/health")
+    response = await test_client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
     assert response.json()["service"] == "profile-service"
 
 
-def test_create_profile_unauthorized(test_client):
+@pytest.mark.asyncio
+async def test_create_profile_unauthorized(test_client):
     """Test creating profile without authentication"""
     profile_data = {
         "userId": str(ObjectId()),
@@ -23,7 +25,7 @@ def test_create_profile_unauthorized(test_client):
         "lastName": "Doe",
         "email": "john@example.com"
     }
-    response = test_client.post("/api/v1/profiles", json=profile_data)
+    response = await test_client.post("/api/v1/profiles", json=profile_data)
     assert response.status_code == 403  # Forbidden - no auth token
 
 
@@ -32,8 +34,8 @@ async def test_create_profile_authorized(test_client, test_db):
     """Test creating profile with authentication"""
     from src.utils.jwt import verify_token
     from src.config.settings import settings
-    from jose import jwt
-    from datetime import datetime, timedelta
+    import jwt
+    from datetime import datetime, timedelta, timezone
     
     # Create a mock JWT token
     user_id = str(ObjectId())
@@ -43,8 +45,8 @@ async def test_create_profile_authorized(test_client, test_db):
         "email": "john@example.com",
         "role": "candidate",
         "isActive": True,
-        "exp": datetime.utcnow() + timedelta(minutes=60),
-        "iat": datetime.utcnow(),
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=60),
+        "iat": datetime.now(timezone.utc),
         "iss": "matchtal-auth-service",
         "aud": "matchtal-platform",
         "type": "access"
@@ -60,7 +62,7 @@ async def test_create_profile_authorized(test_client, test_db):
     }
     
     headers = {"Authorization": f"Bearer {token}"}
-    response = test_client.post("/api/v1/profiles", json=profile_data, headers=headers)
+    response = await test_client.post("/api/v1/profiles", json=profile_data, headers=headers)
     
     # Should succeed (201) or fail with validation (422)
     assert response.status_code in [201, 422]
@@ -70,8 +72,8 @@ async def test_create_profile_authorized(test_client, test_db):
 async def test_get_profile_not_found(test_client, test_db):
     """Test getting non-existent profile"""
     from src.config.settings import settings
-    from jose import jwt
-    from datetime import datetime, timedelta
+    import jwt
+    from datetime import datetime, timedelta, timezone
     
     # Create a mock JWT token
     user_id = str(ObjectId())
@@ -81,8 +83,8 @@ async def test_get_profile_not_found(test_client, test_db):
         "email": "john@example.com",
         "role": "candidate",
         "isActive": True,
-        "exp": datetime.utcnow() + timedelta(minutes=60),
-        "iat": datetime.utcnow(),
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=60),
+        "iat": datetime.now(timezone.utc),
         "iss": "matchtal-auth-service",
         "aud": "matchtal-platform",
         "type": "access"
@@ -91,6 +93,170 @@ async def test_get_profile_not_found(test_client, test_db):
     
     headers = {"Authorization": f"Bearer {token}"}
     fake_id = str(ObjectId())
-    response = test_client.get(f"/api/v1/profiles/{fake_id}", headers=headers)
+    response = await test_client.get(f"/api/v1/profiles/{fake_id}", headers=headers)
     assert response.status_code == 404
 
+
+@pytest.mark.asyncio
+async def test_list_profiles_keyset_pagination(test_client, test_db):
+    """Test paging through profiles with nextCursor, including createdAt ties"""
+    from datetime import timedelta
+    
+    org_id = ObjectId()
+    token = make_token(role="recruiter", organizationId=str(org_id))
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    # Seven profiles over three timestamps, so pages split inside groups of equal createdAt
+    base = datetime(2024, 1, 15, 10, 30, 0)
+    created = [base] * 3 + [base - timedelta(minutes=1)] * 2 + [base - timedelta(minutes=2)] * 2
+    docs = [
+        {
+            "userId": ObjectId(),
+            "organizationId": org_id,
+            "firstName": f"Candidate{i}",
+            "lastName": "Doe",
+            "email": f"candidate{i}@example.com",
+            "isActive": True,
+            "createdAt": created_at,
+            "updatedAt": created_at
+        }
+        for i, created_at in enumerate(created)
+    ]
+    result = await test_db.candidate_profiles.insert_many(docs)
+    expected_ids = [str(doc_id) for doc_id in result.inserted_ids]
+    
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = await test_client.get("/api/v1/profiles", params=params, headers=headers)
+        assert response.status_code == 200
+        pagination = response.json()["data"]["pagination"]
+        assert "total" not in pagination and "pages" not in pagination
+        seen.extend(profile["_id"] for profile in response.json()["data"]["profiles"])
+        pages += 1
+        if not pagination["hasMore"]:
+            assert pagination["nextCursor"] is None
+            break
+        cursor = pagination["nextCursor"]
+    
+    assert pages == 3
+    assert len(seen) == len(set(seen))
+    assert sorted(seen) == sorted(expected_ids)
+    
+    response = await test_client.get("/api/v1/profiles", params={"limit": 3, "includeTotal": "true"}, headers=headers)
+    pagination = response.json()["data"]["pagination"]
+    assert pagination["total"] == 7
+    assert pagination["pages"] == 3
+
+
+@pytest.mark.asyncio
+async def test_update_profile(test_client, test_db, sample_profile):
+    """Test updating a profile returns the updated document with a fresh updatedAt"""
+    await test_db.candidate_profiles.update_one(
+        {"_id": sample_profile["_id"]},
+        {"$set": {"updatedAt": datetime(2024, 1, 15, 10, 30, 0)}}
+    )
+    user_id = str(sample_profile["userId"])
+    headers = {"Authorization": f"Bearer {make_token(sub=user_id, userId=user_id)}"}
+    url = f"/api/v1/profiles/{sample_profile['_id']}"
+    
+    response = await test_client.put(url, json={"location": "Boston, MA"}, headers=headers)
+    assert response.status_code == 200
+    profile = response.json()["data"]["profile"]
+    assert profile["location"] == "Boston, MA"
+    assert profile["updatedAt"] != "2024-01-15T10:30:00Z"
+    
+    # An empty update returns the stored document unchanged
+    response = await test_client.put(url, json={}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["data"]["profile"] == profile
+
+
+def test_cursor_round_trip():
+    """Test encoding and decoding a pagination cursor"""
+    from src.utils.pagination import encode_cursor, decode_cursor
+    
+    doc = {"_id": ObjectId(), "createdAt": datetime(2024, 1, 15, 10, 30, 0)}
+    created_at, doc_id = decode_cursor(encode_cursor(doc))
+    assert created_at == doc["createdAt"]
+    assert doc_id == doc["_id"]
+
+
+@pytest.mark.asyncio
+async def test_list_profiles_invalid_cursor(test_client):
+    """Test listing profiles with a malformed cursor"""
+    headers = {"Authorization": f"Bearer {make_token()}"}
+    response = await test_client.get("/api/v1/profiles?cursor=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+
+
+def test_parse_object_id_invalid():
+    """Test that malformed IDs are rejected with 400"""
+    from fastapi import HTTPException
+    from src.utils.object_id import parse_object_id
+    
+    oid = ObjectId()
+    assert parse_object_id("profile ID", str(oid)) == oid
+    
+    with pytest.raises(HTTPException) as exc_info:
+        parse_object_id("profile ID", "not-an-id")
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Invalid profile ID format"
+
+
+def test_build_pagination():
+    """Test pagination block with and without a total count"""
+    from src.utils.pagination import build_pagination
+    
+    assert build_pagination(10, False) == {"limit": 10, "hasMore": False, "nextCursor": None}
+    
+    pagination = build_pagination(10, True, next_cursor="abc", total=25)
+    assert pagination["nextCursor"] == "abc"
+    assert pagination["total"] == 25
+    assert pagination["pages"] == 3
+
+
+def test_profile_email_validation():
+    """Test that profile emails are checked without email-validator"""
+    from pydantic import ValidationError
+    from src.models.profile import ProfileCreate
+    
+    profile = ProfileCreate(userId=str(ObjectId()), firstName="John", lastName="Doe", email=" john@example.com ")
+    assert profile.email == "john@example.com"
+    
+    with pytest.raises(ValidationError):
+        ProfileCreate(userId=str(ObjectId()), firstName="John", lastName="Doe", email="john.example.com")
+
+
+def test_profile_skill_validation():
+    """Test that individual skills are length-bounded"""
+    from pydantic import ValidationError
+    from src.models.profile import ProfileCreate, ProfileUpdate
+    
+    profile = ProfileCreate(
+        userId=str(ObjectId()), firstName="John", lastName="Doe", email="john@example.com", skills=["Python"]
+    )
+    assert profile.skills == ["Python"]
+    
+    with pytest.raises(ValidationError):
+        ProfileCreate(userId=str(ObjectId()), firstName="John", lastName="Doe", email="john@example.com", skills=[""])
+    with pytest.raises(ValidationError):
+        ProfileUpdate(skills=["x" * 51])
+
+
+def test_validate_object_id():
+    """Test ObjectId field validation"""
+    from src.models.profile import validate_object_id
+    
+    oid = ObjectId()
+    assert validate_object_id(oid) is oid
+    assert validate_object_id(str(oid)) == oid
+    assert validate_object_id(oid.binary) == oid
+    
+    for invalid in ["not-an-id", str(oid) + "\n", b"short", 12345]:
+        with pytest.raises(ValueError):
+            validate_object_id(invalid)
@@ -2,13 +2,20 @@
 Tests for resume endpoints
 """
 import pytest
-from fastapi.testclient import TestClient
 from bson import ObjectId
+from tests.conftest import make_token
 
 
-def test_list_resumes_unauthorized(test_client):
+def auth_headers(profile, **overrides):
+    """Authorization headers for the candidate owning a profile"""
+    user_id = str(profile["userId"])
+    return {"Authorization": f"Bearer {make_token(sub=user_id, userId=user_id, **overrides)}"}
+
+
+@pytest.mark.asyncio
+async def test_list_resumes_unauthorized(test_client):
     """Test listing resumes without authentication"""
-    response = test_client.get("/api/v1/resumes")
+    response = await test_client.get("/api/v1/resumes")
     assert response.status_code == 403  # Forbidden - no auth token
 
 
@@ -21,6 +28,154 @@ async def test_create_resume_metadata_unauthorized(test_client):
         "fileSize": 102400,
         "mimeType": "application/pdf"
     }
-    response = test_client.post("/api/v1/resumes", json=resume_data)
+    response = await test_client.post("/api/v1/resumes", json=resume_data)
     assert response.status_code == 403  # Forbidden - no auth token
 
+
+@pytest.mark.asyncio
+async def test_create_primary_resume_unsets_previous_primary(test_client, test_db, sample_profile, sample_resume):
+    """Test that creating a primary resume inserts it and demotes the existing primary"""
+    resume_data = {
+        "profileId": str(sample_profile["_id"]),
+        "fileName": "resume-v2.pdf",
+        "fileSize": 204800,
+        "mimeType": "application/pdf",
+        "isPrimary": True
+    }
+    response = await test_client.post("/api/v1/resumes", json=resume_data, headers=auth_headers(sample_profile))
+    assert response.status_code == 201
+    
+    created = response.json()["data"]["resume"]
+    assert created["_id"] != str(sample_resume["_id"])
+    assert created["profileId"] == str(sample_profile["_id"])
+    assert created["isPrimary"] is True
+    
+    stored = await test_db.resume_metadata.find_one({"_id": ObjectId(created["_id"])})
+    assert stored["fileName"] == "resume-v2.pdf"
+    assert stored["isPrimary"] is True
+    
+    previous = await test_db.resume_metadata.find_one({"_id": sample_resume["_id"]})
+    assert previous["isPrimary"] is False
+
+
+@pytest.mark.asyncio
+async def test_get_resume_metadata(test_client, test_db, sample_profile, sample_resume):
+    """Test getting a resume returns the document without the joined profile"""
+    response = await test_client.get(f"/api/v1/resumes/{sample_resume['_id']}", headers=auth_headers(sample_profile))
+    assert response.status_code == 200
+    
+    resume = response.json()["data"]["resume"]
+    assert resume["_id"] == str(sample_resume["_id"])
+    assert resume["fileName"] == sample_resume["fileName"]
+    assert "_profile" not in resume
+
+
+@pytest.mark.asyncio
+async def test_get_resume_metadata_profile_missing(test_client, test_db, sample_profile, sample_resume):
+    """Test getting a resume whose owning profile no longer exists"""
+    await test_db.candidate_profiles.delete_one({"_id": sample_profile["_id"]})
+    
+    response = await test_client.get(f"/api/v1/resumes/{sample_resume['_id']}", headers=auth_headers(sample_profile))
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Associated profile not found"
+
+
+@pytest.mark.asyncio
+async def test_get_resume_metadata_other_candidate(test_client, test_db, sample_resume):
+    """Test that candidates cannot view another user's resume"""
+    headers = {"Authorization": f"Bearer {make_token()}"}
+    response = await test_client.get(f"/api/v1/resumes/{sample_resume['_id']}", headers=headers)
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_update_resume_metadata(test_client, test_db, sample_profile, sample_resume):
+    """Test updating a resume returns the updated document with a fresh updatedAt"""
+    from datetime import datetime
+    
+    await test_db.resume_metadata.update_one(
+        {"_id": sample_resume["_id"]},
+        {"$set": {"updatedAt": datetime(2024, 1, 15, 10, 30, 0)}}
+    )
+    url = f"/api/v1/resumes/{sample_resume['_id']}"
+    
+    response = await test_client.put(url, json={"notes": "Updated notes"}, headers=auth_headers(sample_profile))
+    assert response.status_code == 200
+    resume = response.json()["data"]["resume"]
+    assert resume["notes"] == "Updated notes"
+    assert resume["updatedAt"] != "2024-01-15T10:30:00Z"
+    
+    # An empty update returns the stored document unchanged
+    response = await test_client.put(url, json={}, headers=auth_headers(sample_profile))
+    assert response.status_code == 200
+    assert response.json()["data"]["resume"] == resume
+
+
+@pytest.mark.asyncio
+async def test_list_resumes_invalid_cursor(test_client):
+    """Test listing resumes with a malformed cursor"""
+    headers = {"Authorization": f"Bearer {make_token(role='recruiter')}"}
+    response = await test_client.get("/api/v1/resumes?cursor=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_resumes_cursor_pagination(test_client, test_db, sample_profile):
+    """Test paging through a profile's resumes with nextCursor, including uploadedAt ties"""
+    from datetime import datetime, timedelta
+    
+    base = datetime(2024, 1, 15, 10, 30, 0)
+    uploaded = [base] * 3 + [base - timedelta(minutes=1)] * 2
+    docs = [
+        {
+            "profileId": sample_profile["_id"],
+            "fileName": f"resume-{i}.pdf",
+            "fileSize": 102400,
+            "mimeType": "application/pdf",
+            "s3Key": f"resumes/resume-{i}.pdf",
+            "isActive": True,
+            "isPrimary": False,
+            "uploadedAt": uploaded_at,
+            "updatedAt": uploaded_at
+        }
+        for i, uploaded_at in enumerate(uploaded)
+    ]
+    result = await test_db.resume_metadata.insert_many(docs)
+    expected_ids = [str(doc_id) for doc_id in result.inserted_ids]
+    
+    seen = []
+    params = {"profileId": str(sample_profile["_id"]), "limit": 2}
+    while True:
+        response = await test_client.get("/api/v1/resumes", params=params, headers=auth_headers(sample_profile))
+        assert response.status_code == 200
+        pagination = response.json()["data"]["pagination"]
+        seen.extend(resume["_id"] for resume in response.json()["data"]["resumes"])
+        if not pagination["hasMore"]:
+            assert pagination["nextCursor"] is None
+            break
+        params["cursor"] = pagination["nextCursor"]
+    
+    assert len(seen) == len(set(seen))
+    assert sorted(seen) == sorted(expected_ids)
+
+
+def test_mongo_json_response_serializes_object_ids():
+    """Test that raw MongoDB documents render with stringified ObjectIds"""
+    import json
+    from datetime import datetime
+    from src.utils.serialization import MongoJSONResponse
+    
+    resume_id = ObjectId()
+    profile_id = ObjectId()
+    response = MongoJSONResponse({
+        "resumes": [{
+            "_id": resume_id,
+            "profileId": profile_id,
+            "uploadedAt": datetime(2024, 1, 15, 10, 30, 0)
+        }]
+    })
+    body = json.loads(response.body)
+    
+    assert body["resumes"][0]["_id"] == str(resume_id)
+    assert body["resumes"][0]["profileId"] == str(profile_id)
+    assert body["resumes"][0]["uploadedAt"] == "2024-01-15T10:30:00Z"